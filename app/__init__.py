@@ -1,11 +1,29 @@
 from flask import Flask
 import os
 
+try:
+    from flask_caching import Cache
+except ImportError:
+    Cache = None
+
+# Shared cache handle; views can use @cache.cached(...) when the optional
+# flask_caching dependency is installed
+cache = Cache() if Cache is not None else None
+
 
 def create_app(config=None):
     """Create and configure the Flask application"""
     app = Flask(__name__)
 
+    # Pin pyarrow's thread pools once at startup. Per-request reads would
+    # otherwise compete for the full core count and thrash under load.
+    try:
+        import pyarrow
+        pyarrow.set_cpu_count(min(4, os.cpu_count() or 1))
+        pyarrow.set_io_thread_count(2)
+    except ImportError:
+        pass
+
     # Default configuration
     app.config.from_mapping(
         SECRET_KEY=os.environ.get('SECRET_KEY', 'dev_key_for_development_only'),
@@ -18,6 +36,10 @@ def create_app(config=None):
         # Change this line to use from_object instead of from_mapping
         app.config.from_object(config)
 
+    # Attach the response cache backend configured via CACHE_* settings
+    if cache is not None:
+        cache.init_app(app)
+
     # Register blueprints
     from app.controllers.main_controller import main
     from app.controllers.data_controller import data
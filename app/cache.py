@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+from app.utils import clear_response_cache
+from app.models.data_model import DataModel
+from app.models.transporter_model import TransporterModel
+from app.models.analysis_model import AnalysisModel
+
+# Map short names used by the controllers to the model classes
+_MODEL_CLASSES = {
+    'data': DataModel,
+    'transporter': TransporterModel,
+    'analysis': AnalysisModel
+}
+
+
+@lru_cache(maxsize=8)
+def _get_model(cls_name, file_path, mtime):
+    """Build a fully loaded model for (file_path, mtime).
+
+    The mtime argument is only part of the cache key: when the file on disk
+    changes, the key changes and the stale entry is simply not reused.
+    """
+    model_class = _MODEL_CLASSES[cls_name]
+    model = model_class(file_path)
+    model.load_data()
+
+    # Transporter endpoints always need the preprocessing/workload pass,
+    # so pay that cost once here instead of on every request
+    if cls_name == 'transporter':
+        model.preprocess_data()
+        model.analyze_workload()
+
+    return model
+
+
+def get_model(cls_name, file_path):
+    """Get a cached, preloaded model for the given file.
+
+    Models are cached per (file_path, mtime) so repeated requests skip the
+    CSV parse entirely until the underlying file changes.
+    """
+    if cls_name not in _MODEL_CLASSES:
+        raise ValueError(f"Unknown model type: {cls_name}")
+
+    mtime = os.path.getmtime(file_path)
+    return _get_model(cls_name, file_path, mtime)
+
+
+@lru_cache(maxsize=1)
+def available_analyses():
+    """The list of analysis types is static, so compute it only once"""
+    return AnalysisModel().get_available_analyses()
+
+
+@lru_cache(maxsize=16)
+def _sniff_header(file_path, mtime):
+    """Read only the CSV header row instead of parsing the whole file.
+
+    Returns (delimiter, column names), detecting the delimiter the same
+    way as DataModel.load_data.
+    """
+    delimiter = DataModel(file_path)._detect_delimiter()
+    try:
+        columns = pd.read_csv(file_path, delimiter=delimiter, nrows=0).columns.tolist()
+        return delimiter, columns
+    except Exception:
+        raise ValueError(f"Could not parse CSV file with known delimiters: {file_path}")
+
+
+def get_column_names(file_path):
+    """Get the column names of a CSV file, cached per (file_path, mtime)"""
+    mtime = os.path.getmtime(file_path)
+    return _sniff_header(file_path, mtime)[1]
+
+
+@lru_cache(maxsize=32)
+def _unique_values(file_path, mtime, column):
+    """Get unique values of one column by parsing only that column"""
+    delimiter, _ = _sniff_header(file_path, mtime)
+    try:
+        # PyArrow's CSV reader is multithreaded and column projection means
+        # only 1/n_columns of the file's bytes get tokenized
+        import pyarrow.csv as pacsv
+        table = pacsv.read_csv(
+            file_path,
+            parse_options=pacsv.ParseOptions(delimiter=delimiter),
+            convert_options=pacsv.ConvertOptions(include_columns=[column])
+        )
+        return table.column(0).unique().to_pylist()
+    except ImportError:
+        series = pd.read_csv(file_path, delimiter=delimiter, usecols=[column])[column]
+        return series.unique().tolist()
+
+
+def get_unique_values(file_path, column):
+    """Get unique values for a column, cached per (file_path, mtime)"""
+    mtime = os.path.getmtime(file_path)
+    return _unique_values(file_path, mtime, column)
+
+
+# Single background worker used to convert fresh uploads and warm the
+# model cache without blocking the upload response
+_background = ThreadPoolExecutor(max_workers=1, thread_name_prefix='warmup')
+
+
+def warm_in_background(file_path):
+    """Preload the model for a new upload off the request thread.
+
+    Loading the model also writes the parquet sidecar, so by the time the
+    dashboard fires its first data request the heavy parsing is done.
+    """
+    def _warm():
+        try:
+            get_model('data', file_path)
+        except Exception as e:
+            print(f"Background warm-up failed for {file_path}: {e}")
+
+    _background.submit(_warm)
+
+
+def clear_cache():
+    """Drop all cached models (called after a new file upload)"""
+    _get_model.cache_clear()
+    _sniff_header.cache_clear()
+    _unique_values.cache_clear()
+    clear_response_cache()
@@ -1,8 +1,9 @@
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, jsonify, request, g
+import os
 from app.models.transporter_model import TransporterModel
 from app.models.analysis_model import AnalysisModel
-from app.utils import safe_jsonify  # Add this import
-import os
+from app.cache import get_model, available_analyses
+from app.utils import safe_jsonify, cached_safe_jsonify, require_data_file, make_etag  # Add this import
 
 analysis = Blueprint('analysis', __name__)
 
@@ -11,13 +12,19 @@ analysis = Blueprint('analysis', __name__)
 def get_available_analyses():
     """Get list of available analysis types"""
     try:
-        model = AnalysisModel()
-        analyses = model.get_available_analyses()
+        analyses = available_analyses()
 
-        return safe_jsonify({
+        # The list is static, so repeat polls can be answered with 304
+        etag = make_etag('available', ','.join(analyses))
+        if etag in request.if_none_match:
+            return '', 304
+
+        response = safe_jsonify({
             'success': True,
             'analyses': analyses
         })
+        response.set_etag(etag)
+        return response
     except Exception as e:
         return safe_jsonify({
             'success': False,
@@ -26,22 +33,16 @@ def get_available_analyses():
 
 
 @analysis.route('/api/analysis/run/<analysis_type>', methods=['POST'])
+@require_data_file
 def run_analysis(analysis_type):
     """Run a specific analysis"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        file_path = g.data_file
 
         # Get parameters from request
         params = request.json.get('params', {})
 
-        model = AnalysisModel(file_path)
-        model.load_data()
+        model = get_model('analysis', file_path)
 
         # Run the analysis
         result = model.run_analysis(analysis_type, **params)
@@ -64,19 +65,13 @@ def run_analysis(analysis_type):
 
 
 @analysis.route('/api/analysis/run_all', methods=['POST'])
+@require_data_file
 def run_all_analyses():
     """Run all available analyses"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        file_path = g.data_file
 
-        model = AnalysisModel(file_path)
-        model.load_data()
+        model = get_model('analysis', file_path)
 
         # Run all analyses
         results = model.run_all_analyses()
@@ -93,28 +88,26 @@ def run_all_analyses():
 
 
 @analysis.route('/api/transporters/workload')
+@require_data_file
 def analyze_transporter_workload():
     """Analyze transporter workload distribution"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
-
-        model = TransporterModel(file_path)
-        model.load_data()
-        model.preprocess_data()
-
-        workload_stats, hourly_stats = model.analyze_workload()
-
-        return safe_jsonify({
-            'success': True,
-            'workload_stats': workload_stats,
-            'hourly_stats': hourly_stats
-        })
+        file_path = g.data_file
+
+        model = get_model('transporter', file_path)
+
+        # The workload payload is stable until the file changes, so the
+        # serialized body is cached and replayed for repeat polls
+        def build_payload():
+            workload_stats, hourly_stats = model.analyze_workload()
+            return {
+                'success': True,
+                'workload_stats': workload_stats,
+                'hourly_stats': hourly_stats
+            }
+
+        cache_key = ('workload', file_path, os.path.getmtime(file_path))
+        return cached_safe_jsonify(cache_key, build_payload)
     except Exception as e:
         return safe_jsonify({
             'success': False,
@@ -123,30 +116,21 @@ def analyze_transporter_workload():
 
 
 @analysis.route('/api/transporters/highest_inequality')
+@require_data_file
 def get_highest_inequality_periods():
     """Get periods with highest inequality"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        file_path = g.data_file
 
         # Get limit from query parameters
         limit = request.args.get('limit', 5, type=int)
 
-        model = TransporterModel(file_path)
-        model.load_data()
-        model.preprocess_data()
-        model.analyze_workload()
-
-        highest_inequality = model.get_highest_inequality_periods(limit)
+        model = get_model('transporter', file_path)
 
-        return safe_jsonify({
+        cache_key = ('highest_inequality', file_path, os.path.getmtime(file_path), limit)
+        return cached_safe_jsonify(cache_key, lambda: {
             'success': True,
-            'highest_inequality': highest_inequality
+            'highest_inequality': model.get_highest_inequality_periods(limit)
         })
     except Exception as e:
         return safe_jsonify({
@@ -156,30 +140,21 @@ def get_highest_inequality_periods():
 
 
 @analysis.route('/api/transporters/lowest_inequality')
+@require_data_file
 def get_lowest_inequality_periods():
     """Get periods with lowest inequality"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        file_path = g.data_file
 
         # Get limit from query parameters
         limit = request.args.get('limit', 5, type=int)
 
-        model = TransporterModel(file_path)
-        model.load_data()
-        model.preprocess_data()
-        model.analyze_workload()
-
-        lowest_inequality = model.get_lowest_inequality_periods(limit)
+        model = get_model('transporter', file_path)
 
-        return safe_jsonify({
+        cache_key = ('lowest_inequality', file_path, os.path.getmtime(file_path), limit)
+        return cached_safe_jsonify(cache_key, lambda: {
             'success': True,
-            'lowest_inequality': lowest_inequality
+            'lowest_inequality': model.get_lowest_inequality_periods(limit)
         })
     except Exception as e:
         return safe_jsonify({
@@ -189,20 +164,13 @@ def get_lowest_inequality_periods():
 
 
 @analysis.route('/api/transporters/summary')
+@require_data_file
 def get_transporter_summary():
     """Get summary statistics for each transporter"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        file_path = g.data_file
 
-        model = TransporterModel(file_path)
-        model.load_data()
-        model.preprocess_data()
+        model = get_model('transporter', file_path)
 
         transporter_summary = model.get_transporter_summary()
 
@@ -217,30 +185,21 @@ def get_transporter_summary():
         }), 500
 
 @analysis.route('/api/transporters/median_inequality')
+@require_data_file
 def get_median_inequality_periods():
     """Get periods with median inequality (most typical distribution)"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        file_path = g.data_file
 
         # Get limit from query parameters
         limit = request.args.get('limit', 5, type=int)
 
-        model = TransporterModel(file_path)
-        model.load_data()
-        model.preprocess_data()
-        model.analyze_workload()
+        model = get_model('transporter', file_path)
 
-        median_inequality = model.get_median_inequality_periods(limit)
-
-        return safe_jsonify({
+        cache_key = ('median_inequality', file_path, os.path.getmtime(file_path), limit)
+        return cached_safe_jsonify(cache_key, lambda: {
             'success': True,
-            'median_inequality': median_inequality
+            'median_inequality': model.get_median_inequality_periods(limit)
         })
     except Exception as e:
         return safe_jsonify({
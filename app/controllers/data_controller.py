@@ -1,31 +1,33 @@
-from flask import Blueprint, jsonify, request, current_app
-from app.models.data_model import DataModel
-from app.utils import safe_jsonify  # Add this import
+from flask import Blueprint, jsonify, request, g, Response, stream_with_context
 import os
+from app.models.data_model import DataModel
+from app.cache import get_model, get_column_names, get_unique_values as cached_unique_values
+from app.utils import safe_jsonify, json_dumps_bytes, require_data_file, make_etag  # Add this import
 
 data = Blueprint('data', __name__)
 
 
 @data.route('/api/data/summary')
+@require_data_file
 def get_data_summary():
     """Get summary of the loaded data"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
+        file_path = g.data_file
 
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        # Dashboards poll this endpoint; answer repeat polls with 304
+        etag = make_etag(file_path, os.path.getmtime(file_path))
+        if etag in request.if_none_match:
+            return '', 304
 
-        model = DataModel(file_path)
-        model.load_data()
+        model = get_model('data', file_path)
         summary = model.get_data_summary()
 
-        return safe_jsonify({
+        response = safe_jsonify({
             'success': True,
             'summary': summary
         })
+        response.set_etag(etag)
+        return response
     except Exception as e:
         return safe_jsonify({
             'success': False,
@@ -34,25 +36,26 @@ def get_data_summary():
 
 
 @data.route('/api/data/columns')
+@require_data_file
 def get_columns():
     """Get column names from the loaded data"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
+        file_path = g.data_file
 
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        # The column list only changes when the file does
+        etag = make_etag(file_path, os.path.getmtime(file_path))
+        if etag in request.if_none_match:
+            return '', 304
 
-        model = DataModel(file_path)
-        model.load_data()
-        columns = model.get_column_names()
+        # Reads only the header row (cached), not the full file
+        columns = get_column_names(file_path)
 
-        return safe_jsonify({
+        response = safe_jsonify({
             'success': True,
             'columns': columns
         })
+        response.set_etag(etag)
+        return response
     except Exception as e:
         return safe_jsonify({
             'success': False,
@@ -61,28 +64,21 @@ def get_columns():
 
 
 @data.route('/api/data/unique_values/<column>')
+@require_data_file
 def get_unique_values(column):
     """Get unique values for a specific column"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
+        file_path = g.data_file
 
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
-
-        model = DataModel(file_path)
-        model.load_data()
-
-        # Check if column exists
-        if column not in model.data.columns:
+        # Check if column exists (header-only read, cached)
+        if column not in get_column_names(file_path):
             return safe_jsonify({
                 'success': False,
                 'error': f'Column not found: {column}'
             }), 404
 
-        values = model.get_unique_values(column)
+        # Parse only the requested column instead of the whole file
+        values = cached_unique_values(file_path, column)
 
         return safe_jsonify({
             'success': True,
@@ -97,16 +93,11 @@ def get_unique_values(column):
 
 
 @data.route('/api/data/filter', methods=['POST'])
+@require_data_file
 def filter_data():
     """Filter data based on criteria"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        file_path = g.data_file
 
         # Get filters from request
         filters = request.json.get('filters', {})
@@ -117,20 +108,27 @@ def filter_data():
                 'error': 'No filters provided'
             }), 400
 
-        model = DataModel(file_path)
-        model.load_data()
+        model = get_model('data', file_path)
 
         filtered_data = model.filter_data(filters)
 
-        # Convert to a format suitable for JSON
-        result = filtered_data.head(100).to_dict(orient='records')
-
-        return safe_jsonify({
-            'success': True,
-            'data': result,
-            'total_rows': len(filtered_data),
-            'returned_rows': min(100, len(filtered_data))
-        })
+        total_rows = len(filtered_data)
+        returned_rows = min(100, total_rows)
+        head = filtered_data.head(100)
+        columns = list(head.columns)
+
+        def generate():
+            """Stream the rows as one JSON document instead of building all dicts up front"""
+            yield b'{"success": true, "data": ['
+            first = True
+            for row in head.itertuples(index=False):
+                chunk = json_dumps_bytes(dict(zip(columns, row)))
+                yield chunk if first else b',' + chunk
+                first = False
+            yield b'], "total_rows": ' + str(total_rows).encode() + \
+                  b', "returned_rows": ' + str(returned_rows).encode() + b'}'
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
     except Exception as e:
         return safe_jsonify({
             'success': False,
@@ -139,22 +137,30 @@ def filter_data():
 
 
 @data.route('/api/data/sample')
+@require_data_file
 def get_data_sample():
     """Get a sample of the data"""
     try:
-        file_path = current_app.config.get('CURRENT_DATA_FILE')
-
-        if not file_path or not os.path.exists(file_path):
-            return safe_jsonify({
-                'success': False,
-                'error': 'No data file loaded'
-            }), 404
+        file_path = g.data_file
 
         # Get sample size from query parameters
         sample_size = request.args.get('size', 10, type=int)
 
-        model = DataModel(file_path)
-        model.load_data()
+        model = get_model('data', file_path)
+
+        # Arrow-capable clients (JS Arrow, duckdb-wasm) can ask for the
+        # sample as an IPC stream and skip JSON encoding entirely
+        if request.accept_mimetypes.best == 'application/vnd.apache.arrow.stream':
+            try:
+                import pyarrow as pa
+                table = pa.Table.from_pandas(model.data.head(sample_size), preserve_index=False)
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                return Response(sink.getvalue().to_pybytes(),
+                                mimetype='application/vnd.apache.arrow.stream')
+            except ImportError:
+                pass  # fall back to the JSON path below
 
         # Get sample data
         sample_data = model.data.head(sample_size).to_dict(orient='records')
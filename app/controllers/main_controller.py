@@ -1,10 +1,55 @@
 from flask import Blueprint, render_template, request, jsonify, current_app
 import os
+import threading
+import time
 from werkzeug.utils import secure_filename
 from app.utils import safe_jsonify  # Add this import
+from app.cache import clear_cache, warm_in_background
 
 main = Blueprint('main', __name__)
 
+# Cache for the upload-folder scan in get_current_file, so we don't
+# listdir + stat every file on every request
+_SCAN_TTL_SECONDS = 5.0
+_scan_cache = {'path': None, 'checked_at': 0.0, 'refreshing': False}
+
+
+def _scan_upload_folder(upload_folder):
+    """Scan the upload folder for the newest CSV and refresh the cache"""
+    newest_path = None
+    if os.path.exists(upload_folder):
+        csv_files = [f for f in os.listdir(upload_folder) if f.lower().endswith('.csv')]
+        if csv_files:
+            newest_file = max(csv_files, key=lambda f: os.path.getmtime(os.path.join(upload_folder, f)))
+            newest_path = os.path.join(upload_folder, newest_file)
+
+    _scan_cache['path'] = newest_path
+    _scan_cache['checked_at'] = time.monotonic()
+    _scan_cache['refreshing'] = False
+    return newest_path
+
+
+def _find_newest_csv(upload_folder):
+    """Newest CSV in the upload folder, stale-while-revalidate.
+
+    Within the TTL the cached path is returned directly. Past the TTL the
+    stale path is still served immediately and the rescan happens on a
+    background thread, so no request ever waits on the directory walk
+    (except the very first one, which has nothing stale to serve).
+    """
+    now = time.monotonic()
+    if now - _scan_cache['checked_at'] < _SCAN_TTL_SECONDS:
+        return _scan_cache['path']
+
+    if _scan_cache['checked_at'] == 0.0:
+        # Nothing cached yet: resolve synchronously once
+        return _scan_upload_folder(upload_folder)
+
+    if not _scan_cache['refreshing']:
+        _scan_cache['refreshing'] = True
+        threading.Thread(target=_scan_upload_folder, args=(upload_folder,), daemon=True).start()
+    return _scan_cache['path']
+
 
 @main.route('/')
 def index():
@@ -37,18 +82,24 @@ def upload_file():
 
     if file:
         filename = secure_filename(file.filename)
+        # The upload folder is resolved and created once at config import
         upload_folder = current_app.config['UPLOAD_FOLDER']
 
-        # Create upload folder if it doesn't exist
-        if not os.path.exists(upload_folder):
-            os.makedirs(upload_folder)
-
         file_path = os.path.join(upload_folder, filename)
-        file.save(file_path)
+        # Stream to disk in large chunks instead of werkzeug's 16 KB default
+        file.save(file_path, buffer_size=current_app.config.get('UPLOAD_CHUNK_SIZE', 1024 * 1024))
 
         # Store the file path in the session
         current_app.config['CURRENT_DATA_FILE'] = file_path
 
+        # Drop any cached models built from the previous file
+        clear_cache()
+        _scan_cache['checked_at'] = 0.0
+
+        # Parse + convert the upload in the background so the first data
+        # request after an upload hits a warm cache
+        warm_in_background(file_path)
+
         return safe_jsonify({
             'success': True,
             'filename': filename,
@@ -65,15 +116,10 @@ def get_current_file():
 
     # If no file is currently set, check the uploads folder for any CSV files
     if not file_path or not os.path.exists(file_path):
-        upload_folder = current_app.config['UPLOAD_FOLDER']
-        if os.path.exists(upload_folder):
-            csv_files = [f for f in os.listdir(upload_folder) if f.lower().endswith('.csv')]
-            if csv_files:
-                # Use the most recently modified file
-                newest_file = max(csv_files, key=lambda f: os.path.getmtime(os.path.join(upload_folder, f)))
-                file_path = os.path.join(upload_folder, newest_file)
-                # Update the current file in the config
-                current_app.config['CURRENT_DATA_FILE'] = file_path
+        file_path = _find_newest_csv(current_app.config['UPLOAD_FOLDER'])
+        if file_path:
+            # Update the current file in the config
+            current_app.config['CURRENT_DATA_FILE'] = file_path
 
     if file_path and os.path.exists(file_path):
         return safe_jsonify({
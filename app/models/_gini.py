@@ -0,0 +1,127 @@
+"""Vectorized inequality kernels for the workload analysis.
+
+The Gini coefficient used to be computed with an O(n^2) double loop over
+all pairs of workload percentages. The sorted-index formula
+
+    G = sum_i (2*i - n - 1) * x_i / (n * sum(x))   with x sorted ascending
+
+gives the same result in O(n log n). When numba is installed the batch
+kernel is JIT-compiled; otherwise a plain NumPy fallback is used.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def gini(values):
+    """Gini coefficient of a 1-D array of non-negative values"""
+    x = np.sort(np.asarray(values, dtype=np.float64))
+    n = x.size
+    total = x.sum()
+    if n == 0 or total <= 0:
+        return 0.0
+    i = np.arange(1, n + 1, dtype=np.float64)
+    return float(((2.0 * i - n - 1.0) * x).sum() / (n * total))
+
+
+def _gini_per_period_py(values, offsets):
+    """Gini per period for concatenated values delimited by offsets"""
+    out = np.zeros(len(offsets) - 1, dtype=np.float64)
+    for p in range(len(offsets) - 1):
+        # Single-value periods have zero inequality by definition
+        if offsets[p + 1] - offsets[p] <= 1:
+            continue
+        x = np.sort(values[offsets[p]:offsets[p + 1]])
+        n = x.size
+        total = x.sum()
+        if total <= 0:
+            continue
+        acc = 0.0
+        for i in range(n):
+            acc += (2.0 * (i + 1) - n - 1.0) * x[i]
+        out[p] = acc / (n * total)
+    return out
+
+
+def _reduce_periods_py(values, offsets):
+    """Fused max/min/std/Gini per period for concatenated values.
+
+    One pass accumulates sum, sum of squares, max and min; the Gini sort
+    only touches the small per-period slice. Under numba this compiles to
+    a tight loop with no per-period temporaries, and the periods are
+    independent so the outer loop runs in parallel across cores.
+    """
+    n_periods = len(offsets) - 1
+    out_max = np.zeros(n_periods, dtype=np.float64)
+    out_min = np.zeros(n_periods, dtype=np.float64)
+    out_std = np.zeros(n_periods, dtype=np.float64)
+    out_gini = np.zeros(n_periods, dtype=np.float64)
+    for p in prange(n_periods):
+        lo = offsets[p]
+        hi = offsets[p + 1]
+        n = hi - lo
+        if n == 0:
+            continue
+        if n == 1:
+            # Single-value period: no spread, no inequality - skip the
+            # accumulation and the Gini sort entirely
+            out_max[p] = values[lo]
+            out_min[p] = values[lo]
+            continue
+        mx = values[lo]
+        mn = values[lo]
+        s = 0.0
+        s2 = 0.0
+        for i in range(lo, hi):
+            x = values[i]
+            s += x
+            s2 += x * x
+            if x > mx:
+                mx = x
+            if x < mn:
+                mn = x
+        mean = s / n
+        var = s2 / n - mean * mean
+        if var < 0.0:
+            var = 0.0
+        out_max[p] = mx
+        out_min[p] = mn
+        out_std[p] = var ** 0.5
+        if s > 0:
+            x_sorted = np.sort(values[lo:hi])
+            acc = 0.0
+            for i in range(n):
+                acc += (2.0 * (i + 1) - n - 1.0) * x_sorted[i]
+            out_gini[p] = acc / (n * s)
+    return out_max, out_min, out_std, out_gini
+
+
+def _reduce_periods_numpy(values, offsets):
+    """NumPy fallback: segmented reduceat for max/min/std, loop for Gini"""
+    starts = offsets[:-1]
+    counts = np.diff(offsets)
+    out_max = np.maximum.reduceat(values, starts)
+    out_min = np.minimum.reduceat(values, starts)
+    mean = np.add.reduceat(values, starts) / counts
+    sq_mean = np.add.reduceat(values * values, starts) / counts
+    out_std = np.sqrt(np.maximum(sq_mean - mean * mean, 0.0))
+    return out_max, out_min, out_std, _gini_per_period_py(values, offsets)
+
+
+if njit is not None:
+    gini_per_period = njit(cache=True)(_gini_per_period_py)
+    reduce_periods = njit(cache=True, parallel=True)(_reduce_periods_py)
+    # Compile eagerly at import so the first request after a worker boot
+    # doesn't pay the JIT cost; with cache=True the compiled objects are
+    # persisted in __pycache__ and reloaded by later worker spawns.
+    _warm_values = np.array([1.0, 2.0])
+    _warm_offsets = np.array([0, 2], dtype=np.int64)
+    gini_per_period(_warm_values, _warm_offsets)
+    reduce_periods(_warm_values, _warm_offsets)
+else:
+    gini_per_period = _gini_per_period_py
+    reduce_periods = _reduce_periods_numpy
@@ -1,5 +1,7 @@
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Callable, Tuple
 from app.models.data_model import DataModel
 
@@ -15,6 +17,7 @@ class AnalysisModel(DataModel):
         self.analysis_results = {}
         self.available_analyses = self._register_analyses()
         self.max_duration_minutes = max_duration_minutes
+        self._hour_series = None
 
     def _register_analyses(self) -> Dict[str, Callable]:
         """
@@ -46,11 +49,41 @@ class AnalysisModel(DataModel):
         return result
 
     def run_all_analyses(self) -> Dict[str, Dict[str, Any]]:
-        """Run all available analyses"""
-        results = {}
-        for analysis_type in self.available_analyses:
-            results[analysis_type] = self.run_analysis(analysis_type)
-        return results
+        """Run all available analyses concurrently.
+
+        The analyses only read the shared DataFrame (the heavy pandas/numpy
+        kernels release the GIL), so total wall time approaches that of the
+        slowest single analysis instead of the sum.
+        """
+        if self.data is None:
+            raise ValueError("No data loaded")
+
+        # Materialize the shared hour series up front so worker threads
+        # don't race to compute it
+        try:
+            self._get_hour_series()
+        except ValueError:
+            pass
+
+        max_workers = min(len(self.available_analyses), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {name: executor.submit(self.run_analysis, name)
+                       for name in self.available_analyses}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _get_hour_series(self, date_column: Optional[str] = None) -> pd.Series:
+        """Hour-of-day for each row, computed once and shared by the analyses"""
+        if self._hour_series is not None:
+            return self._hour_series
+
+        if not date_column:
+            date_column = self._find_column('date')
+            if not date_column:
+                raise ValueError("Could not identify a date column")
+
+        # One vectorized parse of the column instead of per-row strptime
+        self._hour_series = self._parse_datetime_series(date_column).dt.hour
+        return self._hour_series
 
     def analyze_hourly_activity(self, date_column: Optional[str] = None, **kwargs) -> Dict[str, Any]:
         """
@@ -64,58 +97,32 @@ class AnalysisModel(DataModel):
 
         # Try to identify date column if not provided
         if not date_column:
-            date_columns = [col for col in self.data.columns if
-                            'starttid' in col.lower() or 'start' in col.lower() and 'tid' in col.lower()]
-            if date_columns:
-                date_column = date_columns[0]
-            else:
+            date_column = self._find_column('date')
+            if not date_column:
                 raise ValueError("Could not identify a date column")
 
         try:
-            # Extract hour from the date column
-            from datetime import datetime
-
-            def extract_hour(date_str):
-                """Extract hour from date string"""
-                formats = [
-                    '%d-%m-%Y %H:%M:%S',  # 31-12-2023 22:36:16
-                    '%Y-%m-%d %H:%M:%S',  # 2023-12-31 22:36:16
-                    '%m/%d/%Y %H:%M:%S',  # 12/31/2023 22:36:16
-                    '%d/%m/%Y %H:%M:%S'  # 31/12/2023 22:36:16
-                ]
-
-                if pd.isna(date_str):
-                    return None
-
-                for fmt in formats:
-                    try:
-                        return datetime.strptime(date_str, fmt).hour
-                    except ValueError:
-                        continue
-
-                # If none of the formats match, try extracting from column
-                if 'timme' in self.data.columns or 'hour' in self.data.columns:
-                    hour_col = 'timme' if 'timme' in self.data.columns else 'hour'
-                    return self.data[hour_col]
-
-                return None
-
-            self.data['hour'] = self.data[date_column].apply(extract_hour)
-            hourly_counts = self.data['hour'].value_counts().sort_index()
-            total_count = hourly_counts.sum()
-            hourly_percentages = (hourly_counts / total_count * 100).round(2)
+            # Extract hour from the date column (shared, computed once) and
+            # histogram it with bincount - hours are already small ints, so
+            # no hashing is needed
+            hours = self._get_hour_series(date_column)
+            counts = np.bincount(hours.dropna().to_numpy(dtype=np.int64), minlength=24)
+            total_count = int(counts.sum())
+
+            if total_count > 0:
+                percentages = np.round(counts / total_count * 100, 2)
+            else:
+                percentages = np.zeros(24)
 
-            # Create a complete hourly dataset (including hours with 0 counts)
-            all_hours = list(range(24))
-            complete_counts = [hourly_counts.get(hour, 0) for hour in all_hours]
-            complete_percentages = [hourly_percentages.get(hour, 0) for hour in all_hours]
+            # Hours that actually occur, for peak/slowest selection
+            nonzero = np.flatnonzero(counts)
 
             result = {
-                'hours': all_hours,
-                'counts': complete_counts,
-                'percentages': complete_percentages,
-                'peak_hour': hourly_counts.idxmax() if not hourly_counts.empty else None,
-                'slowest_hour': hourly_counts.idxmin() if hourly_counts.min() > 0 and not hourly_counts.empty else None,
+                'hours': list(range(24)),
+                'counts': counts,
+                'percentages': percentages,
+                'peak_hour': int(np.argmax(counts)) if nonzero.size else None,
+                'slowest_hour': int(nonzero[np.argmin(counts[nonzero])]) if nonzero.size else None,
                 'total': total_count,
                 'max_duration_filter': self.max_duration_minutes
             }
@@ -147,24 +154,19 @@ class AnalysisModel(DataModel):
 
         # Try to identify transport type column if not provided
         if not type_column:
-            type_columns = [col for col in self.data.columns
-                            if 'transportmedel' in col.lower()
-                            or 'transport' in col.lower() and 'typ' in col.lower()
-                            or 'uppdragstyp' in col.lower()]
-            if type_columns:
-                type_column = type_columns[0]
-            else:
+            type_column = self._find_column('transport_type')
+            if not type_column:
                 raise ValueError("Could not identify a transport type column")
 
         try:
-            type_counts = self.data[type_column].value_counts()
+            type_counts = self._value_counts(type_column)
             total_count = type_counts.sum()
             type_percentages = (type_counts / total_count * 100).round(2)
 
             return {
                 'types': type_counts.index.tolist(),
-                'counts': type_counts.values.tolist(),
-                'percentages': type_percentages.values.tolist(),
+                'counts': type_counts.to_numpy(),
+                'percentages': type_percentages.to_numpy(),
                 'most_common': type_counts.index[0] if not type_counts.empty else None,
                 'least_common': type_counts.index[-1] if not type_counts.empty else None,
                 'total': total_count,
@@ -194,47 +196,48 @@ class AnalysisModel(DataModel):
         if self.data is None:
             raise ValueError("No data loaded")
 
-        # Try to identify location columns
-        start_location_columns = [col for col in self.data.columns if
-                                  'startplats' in col.lower() and 'id' not in col.lower()]
-        end_location_columns = [col for col in self.data.columns if
-                                'slutplats' in col.lower() and 'id' not in col.lower()]
+        # Try to identify location columns (resolved once and cached)
+        start_location_column = self._find_column('start_location')
+        end_location_column = self._find_column('end_location')
 
-        if not start_location_columns or not end_location_columns:
+        if not start_location_column or not end_location_column:
             raise ValueError("Could not identify start or end location columns")
 
-        start_location_column = start_location_columns[0]
-        end_location_column = end_location_columns[0]
-
         try:
-            # Analyze start locations
-            start_counts = self.data[start_location_column].value_counts().head(10)
+            # Count start and end locations in a single pass over the two
+            # columns instead of one full value_counts per side
+            stacked = self.data[[start_location_column, end_location_column]].melt(value_name='loc')
+            per_side = stacked.groupby(['variable', 'loc'], sort=False, observed=True).size()
+
+            start_counts = per_side.loc[start_location_column].nlargest(10)
             start_percentages = (start_counts / len(self.data) * 100).round(2)
 
-            # Analyze end locations
-            end_counts = self.data[end_location_column].value_counts().head(10)
+            end_counts = per_side.loc[end_location_column].nlargest(10)
             end_percentages = (end_counts / len(self.data) * 100).round(2)
 
-            # Find most common routes (start -> end)
-            self.data['route'] = self.data[start_location_column] + ' → ' + self.data[end_location_column]
-            route_counts = self.data['route'].value_counts().head(10)
+            # Find most common routes (start -> end) by grouping on the two
+            # columns directly - no N-row string concatenation needed
+            route_counts = self.data.groupby(
+                [start_location_column, end_location_column], sort=False, observed=True
+            ).size().nlargest(10)
+            route_names = [f"{start} → {end}" for start, end in route_counts.index]
             route_percentages = (route_counts / len(self.data) * 100).round(2)
 
             return {
                 'start_locations': {
                     'names': start_counts.index.tolist(),
-                    'counts': start_counts.values.tolist(),
-                    'percentages': start_percentages.values.tolist()
+                    'counts': start_counts.to_numpy(),
+                    'percentages': start_percentages.to_numpy()
                 },
                 'end_locations': {
                     'names': end_counts.index.tolist(),
-                    'counts': end_counts.values.tolist(),
-                    'percentages': end_percentages.values.tolist()
+                    'counts': end_counts.to_numpy(),
+                    'percentages': end_percentages.to_numpy()
                 },
                 'routes': {
-                    'names': route_counts.index.tolist(),
-                    'counts': route_counts.values.tolist(),
-                    'percentages': route_percentages.values.tolist()
+                    'names': route_names,
+                    'counts': route_counts.to_numpy(),
+                    'percentages': route_percentages.to_numpy()
                 },
                 'max_duration_filter': self.max_duration_minutes
             }
@@ -259,29 +262,23 @@ class AnalysisModel(DataModel):
         if self.data is None:
             raise ValueError("No data loaded")
 
-        # Identify start and end time columns
-        start_time_columns = [col for col in self.data.columns if
-                              'start' in col.lower() and 'tid' in col.lower() and 'önskad' not in col.lower()]
-        end_time_columns = [col for col in self.data.columns if
-                            ('slut' in col.lower() or 'stop' in col.lower()) and 'tid' in col.lower()]
+        # Identify start and end time columns (resolved once and cached)
+        start_time_column = self._find_column('start_time')
+        end_time_column = self._find_column('end_time')
 
-        if not start_time_columns or not end_time_columns:
+        if not start_time_column or not end_time_column:
             raise ValueError("Could not identify start or end time columns")
 
-        start_time_column = "Uppdrag Starttid" if "Uppdrag Starttid" in self.data.columns else start_time_columns[0]
-        end_time_column = "Uppdrag Sluttid" if "Uppdrag Sluttid" in self.data.columns else end_time_columns[0]
-
         try:
-            # Create a new column for duration
-            durations = []
-            for _, row in self.data.iterrows():
-                duration = self._calculate_duration_minutes(
-                    row[start_time_column],
-                    row[end_time_column]
-                )
-                durations.append(duration)
-
-            durations = np.array(durations)
+            # Vectorized duration computation from the memoized parsed
+            # columns, subtracting as raw int64 nanoseconds
+            starts = self._parse_datetime_series(start_time_column)
+            ends = self._parse_datetime_series(end_time_column)
+            valid = (starts.notna() & ends.notna()).to_numpy()
+            start_ns = starts.to_numpy().view('int64')[valid]
+            end_ns = ends.to_numpy().view('int64')[valid]
+            durations = (end_ns - start_ns) / 60_000_000_000.0  # ns -> minutes
+
             durations = durations[durations > 0]  # Filter out zero/negative durations
 
             # Note: Now that we've implemented filtering in DataModel, all durations should be <= max_duration_minutes
@@ -307,16 +304,27 @@ class AnalysisModel(DataModel):
             bin_range = range(0, int(self.max_duration_minutes) + 5, 5)
             hist, bin_edges = np.histogram(durations, bins=bin_range)
 
+            # Sort once and take min/max/median from the sorted array; mean
+            # and std share a single sum-of-squares pass. Separate np.min /
+            # np.max / np.mean / np.median / np.std calls would each re-read
+            # the whole array from memory.
+            durations.sort()
+            n = durations.size
+            mean = float(durations.sum()) / n
+            std = float(np.sqrt(max(float(np.dot(durations, durations)) / n - mean * mean, 0.0)))
+            mid = n // 2
+            median = float(durations[mid]) if n % 2 else float(durations[mid - 1] + durations[mid]) / 2.0
+
             return {
-                'min': np.min(durations),
-                'max': np.max(durations),
-                'mean': np.mean(durations),
-                'median': np.median(durations),
-                'std': np.std(durations),
-                'count': len(durations),
+                'min': float(durations[0]),
+                'max': float(durations[-1]),
+                'mean': mean,
+                'median': median,
+                'std': std,
+                'count': n,
                 'histogram': {
-                    'bins': bin_edges[:-1].tolist(),
-                    'values': hist.tolist()
+                    'bins': bin_edges[:-1],
+                    'values': hist
                 },
                 'max_duration_filter': self.max_duration_minutes
             }
@@ -350,47 +358,48 @@ class AnalysisModel(DataModel):
 
         # Try to identify priority column if not provided
         if not priority_column:
-            priority_cols = [col for col in self.data.columns if 'prioritet' in col.lower()]
-            if priority_cols:
-                priority_column = priority_cols[0]
-            else:
+            priority_column = self._find_column('priority')
+            if not priority_column:
                 raise ValueError("Could not identify a priority column")
 
         try:
-            priority_counts = self.data[priority_column].value_counts()
+            priority_counts = self._value_counts(priority_column)
             total_count = priority_counts.sum()
             priority_percentages = (priority_counts / total_count * 100).round(2)
 
             # Calculate priority distribution by hour
-            if 'hour' not in self.data.columns:
-                # If hourly analysis hasn't been run yet, create hour column
-                date_columns = [col for col in self.data.columns if
-                                'starttid' in col.lower() or 'start' in col.lower() and 'tid' in col.lower()]
-                if date_columns:
-                    date_column = date_columns[0]
-                    self.data['hour'] = self.data[date_column].apply(
-                        lambda x: self._parse_datetime(x).hour if self._parse_datetime(x) else None
-                    )
+            try:
+                hours = self._get_hour_series()
+            except ValueError:
+                hours = None
 
             hourly_priority = {}
-            if 'hour' in self.data.columns:
-                for hour in range(24):
-                    hour_data = self.data[self.data['hour'] == hour]
-                    if not hour_data.empty:
-                        hour_counts = hour_data[priority_column].value_counts()
-                        hour_total = hour_counts.sum()
-                        hour_percentages = (hour_counts / hour_total * 100).round(2)
-                        hourly_priority[hour] = {
-                            'priorities': hour_counts.index.tolist(),
-                            'counts': hour_counts.values.tolist(),
-                            'percentages': hour_percentages.values.tolist(),
-                            'total': hour_total
-                        }
+            if hours is not None:
+                # One hash pass over the data instead of 24 boolean masks
+                # plus 24 per-slice value_counts
+                by_hour = self.data.groupby(
+                    [hours, self.data[priority_column]], sort=False, observed=True
+                ).size().unstack(fill_value=0)
+
+                for hour, row in by_hour.iterrows():
+                    # Match the per-slice value_counts output: only
+                    # priorities present in the hour, most common first
+                    row = row[row > 0].sort_values(ascending=False)
+                    hour_total = row.sum()
+                    if hour_total == 0:
+                        continue
+                    hour_percentages = (row / hour_total * 100).round(2)
+                    hourly_priority[int(hour)] = {
+                        'priorities': row.index.tolist(),
+                        'counts': row.to_numpy(),
+                        'percentages': hour_percentages.to_numpy(),
+                        'total': hour_total
+                    }
 
             return {
                 'priorities': priority_counts.index.tolist(),
-                'counts': priority_counts.values.tolist(),
-                'percentages': priority_percentages.values.tolist(),
+                'counts': priority_counts.to_numpy(),
+                'percentages': priority_percentages.to_numpy(),
                 'total': total_count,
                 'hourly_distribution': hourly_priority,
                 'max_duration_filter': self.max_duration_minutes
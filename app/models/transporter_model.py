@@ -3,6 +3,7 @@ import numpy as np
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any, Union
 from app.models.data_model import DataModel
+from app.models._gini import reduce_periods
 
 
 class TransporterModel(DataModel):
@@ -14,42 +15,26 @@ class TransporterModel(DataModel):
         self.workload_stats = None
         self.hourly_stats = None
         self.max_duration_minutes = max_duration_minutes
-
-    def get_highest_inequality_periods(self, limit: int = 5) -> List[Dict[str, Any]]:
-        """Get periods with highest inequality"""
-        if not self.workload_stats:
-            self.analyze_workload()
-
-        # Sort by relative inequality (highest first)
-        sorted_stats = sorted(self.workload_stats, key=lambda x: x['relative_inequality'], reverse=True)
-        return sorted_stats[:limit]
-
-    def get_lowest_inequality_periods(self, limit: int = 5) -> List[Dict[str, Any]]:
-        """Get periods with lowest inequality"""
-        if not self.workload_stats:
-            self.analyze_workload()
-
-        # Filter periods with more than one transporter
-        multi_transporter_periods = [stat for stat in self.workload_stats if stat['num_transporters'] > 1]
-
-        # Sort by relative inequality (lowest first)
-        sorted_stats = sorted(multi_transporter_periods, key=lambda x: x['relative_inequality'])
-        return sorted_stats[:limit]
+        self._ranked_periods = None  # all periods, highest inequality first
+        self._ranked_multi = None  # only multi-transporter periods, ascending
+        # Struct-of-arrays view of processed_data, built in preprocess_data
+        self._start_ns = None
+        self._end_ns = None
+        self._duration_min = None
+        self._tid_codes = None
+        self._tid_labels = None
 
     def get_median_inequality_periods(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get periods with median inequality (most typical distribution)"""
         if not self.workload_stats:
             self.analyze_workload()
 
-        # Filter periods with more than one transporter
-        multi_transporter_periods = [stat for stat in self.workload_stats if stat['num_transporters'] > 1]
+        # Multi-transporter periods sorted ascending, precomputed in analyze_workload
+        sorted_stats = self._ranked_multi
 
-        if not multi_transporter_periods:
+        if not sorted_stats:
             return []
 
-        # Sort by relative inequality
-        sorted_stats = sorted(multi_transporter_periods, key=lambda x: x['relative_inequality'])
-
         # Find the median position(s)
         median_idx = len(sorted_stats) // 2
 
@@ -132,8 +117,41 @@ class TransporterModel(DataModel):
 
         # Filter out rows with missing transporter IDs or times
         valid_rows = df.dropna(subset=[self.transporter_id_column, self.start_time_column, self.end_time_column])
+
+        # Parse both time columns in one vectorized pass each (the parser
+        # detects the format on the first value and hands the whole column
+        # to pd.to_datetime) instead of strptime per row during analysis.
+        # The parsed series are indexed like self.data, so align on index.
+        starts = self._parse_datetime_series(self.start_time_column)
+        ends = self._parse_datetime_series(self.end_time_column)
+        valid_rows = valid_rows.assign(
+            _start_dt=starts.loc[valid_rows.index],
+            _end_dt=ends.loc[valid_rows.index]
+        )
+
+        # Drop rows whose timestamps didn't parse, mirroring the old
+        # per-row skip on parse failure
+        valid_rows = valid_rows[valid_rows['_start_dt'].notna() & valid_rows['_end_dt'].notna()]
         print(f"Valid rows for analysis: {len(valid_rows)} of {len(df)} total")
 
+        # Columnar (struct-of-arrays) view of the rows the analysis kernels
+        # actually touch: contiguous int64 timestamps and integer transporter
+        # codes, instead of going back through DataFrame rows
+        self._start_ns = valid_rows['_start_dt'].to_numpy().view('int64')
+        self._end_ns = valid_rows['_end_dt'].to_numpy().view('int64')
+        # Durations in minutes, computed once and stored as float32: the
+        # values are bounded by the duration filter, so single precision is
+        # plenty and halves the bytes the reductions stream through.
+        # Rows with end before start are clamped to 0 minutes, matching the
+        # old per-row duration helper, so no negative weight ever reaches
+        # the aggregations.
+        self._duration_min = np.maximum(
+            (self._end_ns - self._start_ns) / 60_000_000_000.0, 0.0
+        ).astype(np.float32)
+        tid_cat = valid_rows[self.transporter_id_column].astype('category')
+        self._tid_codes = tid_cat.cat.codes.to_numpy()
+        self._tid_labels = tid_cat.cat.categories.to_numpy()
+
         self.processed_data = valid_rows
         return valid_rows
 
@@ -142,147 +160,130 @@ class TransporterModel(DataModel):
         if self.processed_data is None:
             self.preprocess_data()
 
-        df = self.processed_data
-
-        # Group the data by date and hour
-        transports_by_date_hour = {}
-
-        for _, row in df.iterrows():
-            transporter_id = row[self.transporter_id_column]
-            start_time_str = row[self.start_time_column]
-            end_time_str = row[self.end_time_column]
-
-            start_time = self._parse_datetime(start_time_str)  # Changed from parse_datetime to _parse_datetime
-            end_time = self._parse_datetime(end_time_str)  # Changed from parse_datetime to _parse_datetime
+        # Durations in minutes precomputed in preprocess_data
+        start_ns = self._start_ns
+        durations = self._duration_min
 
-            if not start_time or not end_time:
-                continue
+        # Bucket each row by hour-since-epoch: one int64 division per row
+        # instead of a strftime string key. Integer keys hash faster and the
+        # date/hour are recovered once per unique bucket when emitting.
+        bucket_ids = start_ns // 3_600_000_000_000
 
-            # Calculate duration in minutes
-            duration_minutes = self._calculate_duration_minutes(start_time_str,
-                                                                end_time_str)  # Using the parent's method
+        # Skip rows exceeding max_duration_minutes (should already be filtered)
+        keep = durations <= self.max_duration_minutes
+        dur = durations[keep]
+        codes = self._tid_codes[keep].astype(np.int64)
 
-            # Skip if duration exceeds max_duration_minutes (although this should already be filtered)
-            if duration_minutes > self.max_duration_minutes:
-                continue
+        # Densify bucket ids to 0..n_buckets-1; np.unique returns them
+        # sorted, i.e. chronological, which is the final output order
+        uniq_buckets, bucket_idx = np.unique(bucket_ids[keep], return_inverse=True)
+        n_buckets = int(uniq_buckets.size)
+        n_tids = int(self._tid_labels.size)
 
-            # Format date to YYYY-MM-DD
-            date = start_time.strftime('%Y-%m-%d')
-
-            # Get the hour of the start time
-            hour = start_time.hour
-
-            # Create a key for the date-hour combination
-            date_hour_key = f"{date}-{hour}"
-
-            if date_hour_key not in transports_by_date_hour:
-                transports_by_date_hour[date_hour_key] = {
+        workload_stats = []
+        if n_buckets:
+            # Sum durations per (bucket, transporter) with one bincount over
+            # a flat 2D index - no hash table involved. A second bincount
+            # without weights counts rows, which marks the pairs that
+            # actually occurred (rows summing to zero minutes still count).
+            flat = bucket_idx * n_tids + codes
+            size = n_buckets * n_tids
+            totals_matrix = np.bincount(flat, weights=dur, minlength=size).reshape(n_buckets, n_tids)
+            active = np.bincount(flat, minlength=size).reshape(n_buckets, n_tids) > 0
+            bucket_totals = totals_matrix.sum(axis=1)
+
+            # Flatten the active pairs in bucket-major order; each bucket is
+            # then the contiguous slice offsets[i]:offsets[i+1]
+            rows, cols = np.nonzero(active)
+            counts = active.sum(axis=1).astype(np.int64)
+            offsets = np.concatenate(([0], np.cumsum(counts)))
+            pair_durations = totals_matrix[rows, cols]
+            denom = bucket_totals[rows]
+            pct = np.where(denom > 0, pair_durations / np.where(denom > 0, denom, 1.0) * 100.0, 0.0)
+
+            # One fused kernel computes max/min/population-std/Gini for all
+            # buckets over the flat pct array (numba-compiled when available,
+            # segmented NumPy reductions otherwise)
+            seg_max, seg_min, std_devs, ginis = reduce_periods(pct, offsets)
+
+            # Recover the date string and hour once per unique bucket
+            bucket_times = pd.to_datetime(uniq_buckets * 3600, unit='s')
+            dates = bucket_times.strftime('%Y-%m-%d')
+            hours = bucket_times.hour
+
+            tid_labels = self._tid_labels
+            for i in range(n_buckets):
+                date = dates[i]
+                hour = int(hours[i])
+                num_transporters = int(counts[i])
+                total_duration = float(bucket_totals[i])
+
+                # Calculate expected equal workload per transporter (in %)
+                expected_workload_percent = 100 / num_transporters
+
+                # Actual workload percentages for this bucket's slice
+                lo, hi = offsets[i], offsets[i + 1]
+                workload_percentages = dict(zip(tid_labels[cols[lo:hi]].tolist(), pct[lo:hi].tolist()))
+
+                # Calculate relative inequality (normalized standard deviation)
+                std_dev = float(std_devs[i])
+                relative_inequality = std_dev / expected_workload_percent if expected_workload_percent > 0 else 0
+
+                workload_stats.append({
                     'date': date,
                     'hour': hour,
-                    'transporters': {},
-                    'total_duration': 0
-                }
-
-            # Add duration to transporter
-            if transporter_id not in transports_by_date_hour[date_hour_key]['transporters']:
-                transports_by_date_hour[date_hour_key]['transporters'][transporter_id] = 0
-
-            transports_by_date_hour[date_hour_key]['transporters'][transporter_id] += duration_minutes
-            transports_by_date_hour[date_hour_key]['total_duration'] += duration_minutes
-
-        # Calculate workload distribution and inequality metrics
-        workload_stats = []
-
-        for date_hour_key, data in transports_by_date_hour.items():
-            date = data['date']
-            hour = data['hour']
-            transporters = data['transporters']
-            total_duration = data['total_duration']
-
-            # Get number of transporters working during this hour
-            num_transporters = len(transporters)
-
-            # Skip hours with only one transporter (no inequality to measure)
-            if num_transporters < 1:
-                continue
-
-            # Calculate expected equal workload per transporter (in %)
-            expected_workload_percent = 100 / num_transporters if num_transporters > 0 else 0
-
-            # Calculate actual workload percentages
-            workload_percentages = {}
-            for transporter_id, duration in transporters.items():
-                workload_percentages[transporter_id] = (duration / total_duration) * 100 if total_duration > 0 else 0
-
-            # Calculate inequality metrics
-            percentages = list(workload_percentages.values())
-            max_percent = max(percentages) if percentages else 0
-            min_percent = min(percentages) if percentages else 0
-            range_percent = max_percent - min_percent
-
-            # Calculate standard deviation as a measure of inequality
-            mean = sum(percentages) / len(percentages) if percentages else 0
-            squared_diffs = [(val - mean) ** 2 for val in percentages]
-            variance = sum(squared_diffs) / len(squared_diffs) if squared_diffs else 0
-            std_dev = np.sqrt(variance)
-
-            # Calculate relative inequality (normalized standard deviation)
-            relative_inequality = std_dev / expected_workload_percent if expected_workload_percent > 0 else 0
-
-            # Calculate Gini coefficient
-            sorted_percentages = sorted(percentages)
-            sum_of_differences = 0
-            for i in range(len(sorted_percentages)):
-                for j in range(len(sorted_percentages)):
-                    sum_of_differences += abs(sorted_percentages[i] - sorted_percentages[j])
-
-            sum_percentages = sum(sorted_percentages)
-            gini = sum_of_differences / (2 * len(sorted_percentages) * sum_percentages) if sum_percentages > 0 and len(
-                sorted_percentages) > 0 else 0
-
-            workload_stats.append({
-                'date': date,
-                'hour': hour,
-                'num_transporters': num_transporters,
-                'total_duration_minutes': total_duration,
-                'expected_workload_percent': expected_workload_percent,
-                'range_percent': range_percent,
-                'std_dev': std_dev,
-                'relative_inequality': relative_inequality,  # New field
-                'gini': gini,
-                'workload_details': workload_percentages,
-                'date_hour': f"{date} {hour}:00"
-            })
+                    'num_transporters': num_transporters,
+                    'total_duration_minutes': total_duration,
+                    'expected_workload_percent': expected_workload_percent,
+                    'range_percent': float(seg_max[i] - seg_min[i]),
+                    'std_dev': std_dev,
+                    'relative_inequality': relative_inequality,  # New field
+                    'gini': float(ginis[i]),
+                    'workload_details': workload_percentages,
+                    'date_hour': f"{date} {hour}:00"
+                })
 
-        # Sort by date and hour
-        workload_stats.sort(key=lambda x: (x['date'], x['hour']))
+        # Already sorted by date and hour via the bucket sort above
         self.workload_stats = workload_stats
 
-        # Calculate hourly statistics
+        # Calculate hourly statistics with one grouped pass instead of
+        # scanning workload_stats once per hour of the day
         hourly_stats = []
-        for hour in range(24):
-            hour_data = [stat for stat in workload_stats if stat['hour'] == hour]
-
-            if hour_data:
-                avg_std_dev = sum(stat['std_dev'] for stat in hour_data) / len(hour_data)
-                avg_relative_inequality = sum(stat['relative_inequality'] for stat in hour_data) / len(
-                    hour_data)  # New field
-                avg_gini = sum(stat['gini'] for stat in hour_data) / len(hour_data)
-                avg_transporters = sum(stat['num_transporters'] for stat in hour_data) / len(hour_data)
-                avg_range = sum(stat['range_percent'] for stat in hour_data) / len(hour_data)
-
+        if workload_stats:
+            ws_df = pd.DataFrame(workload_stats)
+            by_hour = ws_df.groupby('hour', sort=True)
+            means = by_hour[['std_dev', 'relative_inequality', 'gini',
+                             'num_transporters', 'range_percent']].mean()
+            hour_counts = by_hour.size()
+
+            for hour, row in means.iterrows():
+                hour = int(hour)
                 hourly_stats.append({
                     'hour': hour,
-                    'avg_std_dev': avg_std_dev,
-                    'avg_relative_inequality': avg_relative_inequality,  # New field
-                    'avg_gini': avg_gini,
-                    'avg_transporters': avg_transporters,
-                    'avg_range': avg_range,
-                    'count': len(hour_data),
+                    'avg_std_dev': float(row['std_dev']),
+                    'avg_relative_inequality': float(row['relative_inequality']),  # New field
+                    'avg_gini': float(row['gini']),
+                    'avg_transporters': float(row['num_transporters']),
+                    'avg_range': float(row['range_percent']),
+                    'count': int(hour_counts[hour]),
                     'hour_formatted': f"{hour}:00"
                 })
 
         self.hourly_stats = hourly_stats
+
+        # Rank once here so the highest/lowest/median endpoints reduce to
+        # list slicing instead of re-sorting per request. Ranking numeric
+        # key arrays in NumPy skips the Python key callable per comparison;
+        # the full order is kept (not just a top-k partition) because the
+        # median endpoint needs positions in the middle of the ranking.
+        rel = np.array([stat['relative_inequality'] for stat in workload_stats], dtype=np.float64)
+        num = np.array([stat['num_transporters'] for stat in workload_stats], dtype=np.int64)
+        order = np.argsort(-rel, kind='stable')
+        self._ranked_periods = [workload_stats[i] for i in order]
+        multi = np.flatnonzero(num > 1)
+        multi_order = multi[np.argsort(rel[multi], kind='stable')]
+        self._ranked_multi = [workload_stats[i] for i in multi_order]
+
         return workload_stats, hourly_stats
 
     def get_highest_inequality_periods(self, limit: int = 5) -> List[Dict[str, Any]]:
@@ -290,60 +291,59 @@ class TransporterModel(DataModel):
         if not self.workload_stats:
             self.analyze_workload()
 
-        # Sort by relative inequality (highest first)
-        sorted_stats = sorted(self.workload_stats, key=lambda x: x['relative_inequality'], reverse=True)
-        return sorted_stats[:limit]
+        # Slice the ranking precomputed in analyze_workload (highest first)
+        return self._ranked_periods[:limit]
 
     def get_lowest_inequality_periods(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get periods with lowest inequality"""
         if not self.workload_stats:
             self.analyze_workload()
 
-        # Filter periods with more than one transporter
-        multi_transporter_periods = [stat for stat in self.workload_stats if stat['num_transporters'] > 1]
-
-        # Sort by relative inequality (lowest first)
-        sorted_stats = sorted(multi_transporter_periods, key=lambda x: x['relative_inequality'])
-        return sorted_stats[:limit]
+        # Slice the precomputed multi-transporter ranking (lowest first)
+        return self._ranked_multi[:limit]
 
     def get_transporter_summary(self) -> List[Dict[str, Any]]:
         """Get summary statistics for each transporter"""
         if self.processed_data is None:
             self.preprocess_data()
 
-        df = self.processed_data
+        # All per-transporter metrics come from bincount reductions over the
+        # SoA arrays instead of one full DataFrame scan per transporter.
+        # _duration_min is already clamped to >= 0 in preprocess_data.
+        durations = self._duration_min
+        codes = self._tid_codes.astype(np.int64)
+        n_tids = int(self._tid_labels.size)
+
+        transport_counts = np.bincount(codes, minlength=n_tids)
+        total_minutes = np.bincount(codes, weights=durations, minlength=n_tids)
+
+        # Busiest hour per transporter via one count over a flat
+        # (transporter, hour-of-day) grid
+        hours = ((self._start_ns // 3_600_000_000_000) % 24).astype(np.int64)
+        hour_grid = np.bincount(codes * 24 + hours, minlength=n_tids * 24).reshape(n_tids, 24)
+        busiest_hours = hour_grid.argmax(axis=1)
+
+        # self.transporters may include ids whose rows were all dropped in
+        # preprocessing; they keep their zero-valued summary entries
+        label_to_code = {label: code for code, label in enumerate(self._tid_labels.tolist())}
 
         transporter_summary = []
         for transporter in self.transporters:
-            # Filter data for this transporter
-            transporter_data = df[df[self.transporter_id_column] == transporter]
-
-            # Calculate total transport time
-            total_time = 0
-            for _, row in transporter_data.iterrows():
-                duration = self._calculate_duration_minutes(
-                    # Changed from calculate_duration_minutes to _calculate_duration_minutes
-                    row[self.start_time_column],
-                    row[self.end_time_column]
-                )
-                total_time += duration
-
-            # Calculate average transport duration
-            avg_duration = total_time / len(transporter_data) if len(transporter_data) > 0 else 0
-
-            # Find busiest hour
-            transporter_by_hour = transporter_data.copy()
-            transporter_by_hour['hour'] = transporter_by_hour[self.start_time_column].apply(
-                lambda x: self._parse_datetime(x).hour if self._parse_datetime(x) else None  # Changed method name
-            )
-            hour_counts = transporter_by_hour['hour'].value_counts()
-            busiest_hour = hour_counts.idxmax() if not hour_counts.empty else None
+            code = label_to_code.get(transporter)
+            if code is not None and transport_counts[code] > 0:
+                count = int(transport_counts[code])
+                total_time = float(total_minutes[code])
+                busiest_hour = int(busiest_hours[code])
+            else:
+                count = 0
+                total_time = 0
+                busiest_hour = None
 
             transporter_summary.append({
                 'transporter_id': transporter,
-                'total_transports': len(transporter_data),
+                'total_transports': count,
                 'total_minutes': total_time,
-                'avg_duration': avg_duration,
+                'avg_duration': total_time / count if count > 0 else 0,
                 'busiest_hour': busiest_hour,
                 'max_duration': self.max_duration_minutes  # Include the max duration in summary
             })
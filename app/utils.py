@@ -1,7 +1,15 @@
+import hashlib
 import json
+import os
 import numpy as np
+from collections import OrderedDict
 from functools import wraps
-from flask import jsonify
+from flask import jsonify, Response, current_app, g
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def numpy_safe_json(obj):
@@ -21,6 +29,76 @@ def numpy_safe_json(obj):
     return obj
 
 
+def require_data_file(f):
+    """Resolve and validate the current data file once per request.
+
+    Replaces the config lookup + existence check repeated in every data
+    endpoint; the validated path is exposed to the handler as g.data_file.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        file_path = current_app.config.get('CURRENT_DATA_FILE')
+        if not file_path or not os.path.exists(file_path):
+            return safe_jsonify({
+                'success': False,
+                'error': 'No data file loaded'
+            }), 404
+        g.data_file = file_path
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def make_etag(*parts):
+    """Build a stable ETag from the given parts (e.g. file path and mtime)"""
+    return hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def json_dumps_bytes(obj):
+    """Encode a single object to JSON bytes, handling NumPy types"""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS matches jsonify's coercion of int dict keys
+        # (e.g. the hourly_distribution payload keyed by hour)
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS,
+            default=numpy_safe_json
+        )
+    return json.dumps(numpy_safe_json(obj)).encode('utf-8')
+
+
+# Serialized response bodies for payloads that are stable until the data
+# file changes, keyed by (endpoint, file path, mtime, ...). Bounded LRU:
+# keys include the file mtime and client-supplied parameters like limit,
+# so without an eviction policy a churning file or a scan over limit
+# values would grow the cache forever.
+_RESPONSE_CACHE_MAXSIZE = 32
+_response_cache = OrderedDict()
+
+
+def cached_safe_jsonify(cache_key, build_payload):
+    """Serve a response whose serialized body is cached per key.
+
+    The workload payload can hold tens of thousands of dicts; re-encoding
+    it on every dashboard poll costs more than the lookup. build_payload
+    is only called on a cache miss, so repeat requests skip both payload
+    assembly and JSON encoding.
+    """
+    body = _response_cache.get(cache_key)
+    if body is None:
+        body = json_dumps_bytes(build_payload())
+        _response_cache[cache_key] = body
+        if len(_response_cache) > _RESPONSE_CACHE_MAXSIZE:
+            _response_cache.popitem(last=False)
+    else:
+        _response_cache.move_to_end(cache_key)
+    return Response(body, mimetype='application/json')
+
+
+def clear_response_cache():
+    """Drop all cached response bodies (called after a new file upload)"""
+    _response_cache.clear()
+
+
 def safe_jsonify(*args, **kwargs):
     """Safely convert the response to JSON handling NumPy types"""
     if args and kwargs:
@@ -30,4 +108,16 @@ def safe_jsonify(*args, **kwargs):
     else:
         data = args or kwargs
 
-    return jsonify(numpy_safe_json(data))
\ No newline at end of file
+    if orjson is not None:
+        # orjson serializes numpy scalars/arrays and datetimes natively in C,
+        # which is several times faster than the stdlib json used by jsonify.
+        # OPT_NON_STR_KEYS reproduces jsonify's coercion of non-string dict
+        # keys, which the hour-keyed priority payload relies on.
+        body = orjson.dumps(
+            data,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS,
+            default=numpy_safe_json
+        )
+        return Response(body, mimetype='application/json')
+
+    return jsonify(numpy_safe_json(data))
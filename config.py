@@ -1,28 +1,86 @@
 import os
 
+# Environment-derived settings are resolved exactly once at import time;
+# everything below reads from a plain-dict snapshot, so no lookup goes
+# through the os.environ mapping proxy again
+_ENV = dict(os.environ)
+_SECRET_KEY = _ENV.get('SECRET_KEY')
+_UPLOAD_FOLDER = os.path.abspath(_ENV.get('UPLOAD_FOLDER', os.path.join(os.getcwd(), 'uploads')))
+# Create the upload directory once at import so the upload handler never
+# has to stat + mkdir per request
+os.makedirs(_UPLOAD_FOLDER, exist_ok=True)
+
+# Single shared int, referenced by every config subclass
+_MAX_UPLOAD_BYTES = 16 * 1024 * 1024  # 16 MB max file size
+
+# Bind options for the development/waitress servers, parsed once at
+# import; run.py splats these into the server call
+_SERVER = {
+    'host': _ENV.get('HOST', '0.0.0.0'),
+    'port': int(_ENV.get('PORT', '5000')),
+}
+
+_CACHE_TYPE = _ENV.get('CACHE_TYPE', 'SimpleCache')
+_CACHE_DEFAULT_TIMEOUT = int(_ENV.get('CACHE_DEFAULT_TIMEOUT', '1000'))
+_CACHE_REDIS_URL = _ENV.get('CACHE_REDIS_URL')
+
 class Config:
     """Base configuration"""
-    SECRET_KEY = os.environ.get('SECRET_KEY', 'dev_key_for_development_only')
-    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', os.path.join(os.getcwd(), 'uploads'))
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max file size
+    # All settings are class-level constants; instances (if any are ever
+    # made) carry no per-instance dict
+    __slots__ = ()
+    SECRET_KEY = _SECRET_KEY or 'dev_key_for_development_only'
+    UPLOAD_FOLDER = _UPLOAD_FOLDER
+    MAX_CONTENT_LENGTH = _MAX_UPLOAD_BYTES
+    # Keep at most 1 MB of form data in RAM (werkzeug reads this from app
+    # config) and stream uploads to disk in 1 MB chunks
+    MAX_FORM_MEMORY_SIZE = 1024 * 1024
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
     CURRENT_DATA_FILE = None
+    SERVER = _SERVER
+    # Flask-Caching backend settings; picked up by cache.init_app when
+    # flask_caching is installed
+    CACHE_TYPE = _CACHE_TYPE
+    CACHE_DEFAULT_TIMEOUT = _CACHE_DEFAULT_TIMEOUT
+    CACHE_REDIS_URL = _CACHE_REDIS_URL
 
 class DevelopmentConfig(Config):
     """Development configuration"""
+    __slots__ = ()
     DEBUG = True
     TESTING = False
 
+class _LazyUploadDir:
+    """Descriptor that resolves (and creates) a directory on first read.
+
+    Keeps test-only directories from being created by dev/prod imports;
+    the makedirs only fires when the owning config is actually used.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._path = None
+
+    def __get__(self, obj, owner=None):
+        if self._path is None:
+            self._path = os.path.abspath(os.path.join(os.getcwd(), self._name))
+            os.makedirs(self._path, exist_ok=True)
+        return self._path
+
 class TestingConfig(Config):
     """Testing configuration"""
+    __slots__ = ()
     DEBUG = False
     TESTING = True
-    UPLOAD_FOLDER = os.path.join(os.getcwd(), 'test_uploads')
+    UPLOAD_FOLDER = _LazyUploadDir('test_uploads')
 
 class ProductionConfig(Config):
     """Production configuration"""
+    __slots__ = ()
     DEBUG = False
     TESTING = False
-    SECRET_KEY = os.environ.get('SECRET_KEY')  # Must be set in environment
+    SECRET_KEY = _SECRET_KEY  # Must be set in environment
+    # Prefer a shared Redis cache across workers when a URL is provided
+    CACHE_TYPE = 'RedisCache' if _CACHE_REDIS_URL else _CACHE_TYPE
 
 # Configuration dictionary
 config = {
@@ -30,4 +88,8 @@ config = {
     'testing': TestingConfig,
     'production': ProductionConfig,
     'default': DevelopmentConfig
-}
\ No newline at end of file
+}
+
+def get_config(env=None):
+    """Resolve the config class for an environment name in one lookup"""
+    return config.get(env, DevelopmentConfig)
\ No newline at end of file
@@ -0,0 +1,13 @@
+import os
+
+# The analysis endpoints are CPU-bound in Python/pandas, so threads would
+# serialize on the GIL. Use one sync worker per core instead.
+workers = os.cpu_count() or 2
+worker_class = 'sync'
+
+# Import the app (and warm module-level caches) once before forking, so
+# loaded DataFrames and JIT caches are shared copy-on-write across workers.
+preload_app = True
+
+bind = '0.0.0.0:' + os.environ.get('PORT', '5000')
+timeout = 120
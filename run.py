@@ -1,22 +1,67 @@
+import logging
 import os
-from app import create_app
-from config import config
 
-# Get environment from system environment variable or use default
-env = os.environ.get('FLASK_ENV', 'development')
-app_config = config.get(env, config['default'])
+log = logging.getLogger('sahlgrenska.run')
 
-# Create the app
-app = create_app(app_config)
 
-# Print all registered routes to debug
-with app.app_context():
-    print("\n==== Registered Routes ====")
-    for rule in app.url_map.iter_rules():
-        print(f"{rule} - {rule.endpoint}")
-    print("==========================\n")
+def main():
+    """Build the app and run the development server.
+
+    The app package and its blueprint graph are only imported here, so
+    importing run as a module (tooling, discovery) stays nearly free;
+    production serving goes through wsgi.py instead.
+    """
+    from app import create_app
+    from config import get_config
+
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+    # Get environment from system environment variable or use default
+    env = os.environ.get('FLASK_ENV', 'development')
+    app_config = get_config(env)
+
+    # Create the app
+    app = create_app(app_config)
+
+    # Log the registered routes at DEBUG only: isEnabledFor short-circuits
+    # both the string building and the emit unless LOG_LEVEL=DEBUG, and a
+    # single buffered record replaces one stdout flush per rule
+    if log.isEnabledFor(logging.DEBUG):
+        with app.app_context():
+            lines = [f"{rule} - {rule.endpoint}" for rule in app.url_map.iter_rules()]
+            log.debug("Registered routes:\n%s", "\n".join(lines))
+
+    # Run the app. Bind options come pre-parsed from the config, debug
+    # follows the selected config instead of being forced on, and the
+    # reloader (which re-imports everything on each save) is opt-in via
+    # FLASK_RELOAD=1.
+    server = getattr(app_config, 'SERVER', {})
+    host = server.get('host', '0.0.0.0')
+    port = server.get('port', 5000)
+    debug = bool(getattr(app_config, 'DEBUG', False))
+
+    if not debug:
+        # Non-debug starts prefer waitress when installed: a threaded WSGI
+        # server that handles concurrent requests, unlike the
+        # single-threaded Werkzeug dev server. gunicorn via wsgi.py remains
+        # the primary production entry point.
+        try:
+            from waitress import serve
+        except ImportError:
+            serve = None
+        if serve is not None:
+            serve(app, host=host, port=port,
+                  threads=int(os.environ.get('WAITRESS_THREADS', '8')))
+            return
+
+    app.run(
+        host=host,
+        port=port,
+        debug=debug,
+        use_reloader=os.environ.get('FLASK_RELOAD') == '1',
+        use_debugger=debug
+    )
+
 
 if __name__ == '__main__':
-    # Run the app
-    port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    main()
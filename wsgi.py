@@ -0,0 +1,8 @@
+import os
+from app import create_app
+from config import get_config
+
+# WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:application
+# Environment resolution goes through the same get_config helper as run.py
+env = os.environ.get('FLASK_ENV', 'production')
+application = create_app(get_config(env))